@@ -23,18 +23,22 @@
 import os
 import FreeCAD
 import BearUtils
-import math
-import DraftVecUtils
+import time
 from BearMaker import bearMaker
 from BearUtils import _iconPath
+from BearStats import bearStats
 
 
 class bearBaseObject:
     propertyChange = ''
-    backup = {'type':''}
+    attachFingerprint = None
+    attachGeometry = None
+    attachRef = None
+    attachRepair = None
 
-    def __init__(self, obj, type, attachTo):
+    def __init__(self, obj, type, attachTo, sizeCode=None, props=None):
 #        FreeCAD.Console.PrintMessage("bearBaseObject.__init__\n")
+        self.backup = {'type':''}
         obj.addProperty("App::PropertyDistance", "offset", "Parameters", "Offset from surface").offset = 0.0
         obj.addProperty("App::PropertyBool", "invert", "Parameters", "Invert bearing direction").invert = False
         obj.addProperty("App::PropertyXLinkSub", "baseObject", "Parameters", "Base object").baseObject = attachTo
@@ -47,46 +51,106 @@ class bearBaseObject:
         #*** add sizes accroding the Bearing type ***
         sizeCodes = bearMaker.getAllSizeCodes(type)
         obj.addProperty("App::PropertyEnumeration", 'sizeCode', 'Parameters', 'Bearing Size').sizeCode = sizeCodes
-        obj.sizeCode = sizeCodes[0]
+        if sizeCode in sizeCodes:
+            obj.sizeCode = sizeCode
+        else:
+            obj.sizeCode = sizeCodes[0]
 
         #*** add Family-Properties ***
         self.backup['type'] = type
         self.addFamilyProperties(obj)
+        self.addShapeProperties(obj)
+        if props is not None:
+            for prop, value in props.items():
+                setattr(obj, prop, value)
         obj.Proxy = self
 
+    def onDocumentRestored(self, obj):
+        # older documents were saved without backup, rebuild it from the restored properties
+        if 'backup' not in self.__dict__:
+            self.backupProperties(obj)
+        self.addShapeProperties(obj)
+
     def onBeforeChange(self, obj, prop):
 #        FreeCAD.Console.PrintMessage("onBeforeChange: " + self.propertyChange + "\n")
-        self.propertyChange = prop
+        if not isinstance(self.propertyChange, list):
+            self.propertyChange = []
+        if prop not in self.propertyChange:
+            self.propertyChange.append(prop)
 #        FreeCAD.Console.PrintMessage("modified: " + prop + "  old Val: " + str(getattr(obj, prop)) + "\n")
 
     def execute(self, fp):
 #        FreeCAD.Console.PrintMessage("execute\n")
+        bearStats.group = fp.type
         try:
-            shape = fp.baseObject[0].Shape.getElement(fp.baseObject[1][0])
-        except:
-            shape = None
-
-        if 'type' in self.propertyChange:
-            sizeCodes = bearMaker.getAllSizeCodes(fp.type)
+            with bearStats.phase('execute'):
+                self.executeStages(fp)
+        finally:
+            bearStats.group = ''
+
+    def executeStages(self, fp):
+        changed = self.propertyChange
+        if not isinstance(changed, list):
+            changed = []
+
+        with bearStats.phase('attachment'):
+            shape = bearGetAttachment(self, fp)
+
+        if not self.isShapeChange(fp, changed):
+            # only placement inputs or the base object changed: keep the generated shape
+            # and move it, unless the attachment geometry is still the same
+            fingerprint = bearGetAttachFingerprint(fp, shape)
+            if fingerprint != self.attachFingerprint:
+                if shape is not None:
+                    with bearStats.phase('placement'):
+                        bearMoveToObject(fp, shape)
+                self.attachFingerprint = fingerprint
+            bearRecordAttachment(self, fp, shape)
+            self.propertyChange = []
+            return
+
+        if 'type' in changed:
+            with bearStats.phase('catalog'):
+                sizeCodes = bearMaker.getAllSizeCodes(fp.type)
             fp.sizeCode = sizeCodes
             fp.sizeCode = sizeCodes[0]
 
-        if 'type' in self.propertyChange or 'sizeCode' in self.propertyChange:
-            self.addFamilyProperties(fp)
+        if 'type' in changed or 'sizeCode' in changed:
+            with bearStats.phase('familyProperties'):
+                self.addFamilyProperties(fp)
 
-        self.propertyChange = ''
         self.backupProperties(fp)
 #        FreeCAD.Console.PrintMessage("execute(): ")
 #        FreeCAD.Console.PrintMessage(self.backup)
 #        FreeCAD.Console.PrintMessage("\n")
 
-        shp = bearMaker.createBearing(fp)
-        fp.Shape = shp
+        with bearStats.phase('createBearing'):
+            shp = bearMaker.createBearing(fp)
+        with bearStats.phase('assignShape'):
+            fp.Shape = shp
 
         fp.Label2 = fp.sizeCode + self.getFamilyPropSuffix(fp)
 
-        if shape is not None:
-            bearMoveToObject(fp, shape)
+        # the new shape keeps fp.Placement, it only has to move if the attachment changed
+        fingerprint = bearGetAttachFingerprint(fp, shape)
+        if shape is not None and fingerprint != self.attachFingerprint:
+            with bearStats.phase('placement'):
+                bearMoveToObject(fp, shape)
+        self.attachFingerprint = fingerprint
+        bearRecordAttachment(self, fp, shape)
+        # forget the changes execute made itself
+        self.propertyChange = []
+
+    def getShapeProperties(self, obj):
+        return ['type', 'sizeCode'] + list(BearUtils.bearItemsTable[obj.type][2]) + list(BearUtils.bearShapeParams)
+
+    def isShapeChange(self, obj, changed):
+        if obj.Shape.isNull():
+            return True
+        for prop in self.getShapeProperties(obj):
+            if prop in changed:
+                return True
+        return False
 
     def addFamilyProperties(self, obj):
         if self.backup['type'] != '':
@@ -108,6 +172,13 @@ class bearBaseObject:
 #                    FreeCAD.Console.PrintMessage("propType is NOT Enum\n")
                     setattr(obj, prop, self.backup[prop])
 
+    def addShapeProperties(self, obj):
+        for prop, (desc, items) in BearUtils.bearShapeParams.items():
+            if not hasattr(obj, prop):
+                obj.addProperty("App::PropertyEnumeration", prop, 'Parameters', desc)
+                setattr(obj, prop, items)
+                setattr(obj, prop, items[0])
+
     def getFamilyPropSuffix(Self, obj):
         propContent = ""
         for prop, propType in BearUtils.bearItemsTable[obj.type][2].items():
@@ -117,13 +188,251 @@ class bearBaseObject:
         return propContent
 
     def backupProperties(self, obj):
-        self.backup.clear()
+        self.backup = {}
         self.backup['type'] = obj.type
         self.backup['sizeCode'] = obj.sizeCode
 
         for prop in BearUtils.bearItemsTable[obj.type][2]:
 #            FreeCAD.Console.PrintMessage("backupProperties(): " + str(prop) + "\n")
-            self.backup[prop] = getattr(obj, prop) #bearMaker.getParamItems(obj.type, prop, propType, obj.sizeCode)
+            if hasattr(obj, prop):
+                self.backup[prop] = getattr(obj, prop) #bearMaker.getParamItems(obj.type, prop, propType, obj.sizeCode)
+
+
+#****************************************************************************
+
+class bearLinkObject:
+    attachFingerprint = None
+    attachGeometry = None
+    attachRef = None
+    attachRepair = None
+
+    def __init__(self, obj, master, attachTo):
+        obj.addProperty("App::PropertyDistance", "offset", "Parameters", "Offset from surface").offset = 0.0
+        obj.addProperty("App::PropertyBool", "invert", "Parameters", "Invert bearing direction").invert = False
+        obj.addProperty("App::PropertyXLinkSub", "baseObject", "Parameters", "Base object").baseObject = attachTo
+        obj.LinkedObject = master
+        obj.Proxy = self
+
+    def execute(self, fp):
+        shape = bearGetAttachment(self, fp)
+
+        if fp.LinkedObject is not None:
+            fp.Label2 = fp.LinkedObject.Label2
+
+        fingerprint = bearGetAttachFingerprint(fp, shape)
+        if fingerprint != self.attachFingerprint:
+            if shape is not None:
+                bearMoveToObject(fp, shape)
+            self.attachFingerprint = fingerprint
+        bearRecordAttachment(self, fp, shape)
+
+
+def bearIsBearing(obj):
+    return hasattr(obj, 'Proxy') and isinstance(obj.Proxy, (bearBaseObject, bearLinkObject))
+
+
+def bearGetMasterKey(type, sizeCode, props):
+    sizeCodes = bearMaker.getAllSizeCodes(type)
+    if sizeCode not in sizeCodes:
+        sizeCode = sizeCodes[0]
+    famProps = []
+    for prop, propType in BearUtils.bearItemsTable[type][2].items():
+        if props is not None and prop in props:
+            value = props[prop]
+        else:
+            value = bearMaker.getParamItems(type, prop, propType, sizeCode)
+            if isinstance(value, (tuple, list)):
+                value = value[0]
+        famProps.append((prop, str(value)))
+    shapeProps = []
+    for prop, (desc, items) in BearUtils.bearShapeParams.items():
+        if props is not None and prop in props:
+            shapeProps.append((prop, str(props[prop])))
+        else:
+            shapeProps.append((prop, str(items[0])))
+    return (type, sizeCode, tuple(famProps), tuple(shapeProps))
+
+
+def bearGetMasters(doc):
+    masters = {}
+    for obj in doc.Objects:
+        if hasattr(obj, 'Proxy') and isinstance(obj.Proxy, bearLinkObject) and obj.LinkedObject is not None:
+            master = obj.LinkedObject
+            masters[bearMaker.getShapeKey(master)[:4]] = master
+    return masters
+
+
+def bearGetAutoSize(type, attachTo):
+    try:
+        data = BearUtils.bearGetCircleData(attachTo[0].Shape.getElement(attachTo[1][0]))
+    except Exception:
+        data = None
+    if data is None:
+        FreeCAD.Console.PrintWarning("No " + type + " bearing size for a non-circular attachment\n")
+        return None
+    sizeCode = bearMaker.findSizeCode(type, 2 * data[6])
+    if sizeCode is None:
+        FreeCAD.Console.PrintWarning("No " + type + " bearing fits diameter " + str(round(2 * data[6], 3)) + "\n")
+    return sizeCode
+
+
+def bearMakeBearings(items, doc=None, useLinks=False):
+    # items: iterable of (type, sizeCode, props, target), target being an
+    # attachment (obj, [subElement]), a FreeCAD.Placement or None.
+    # sizeCode 'auto' picks the size whose bore or outside diameter fits the attached circle,
+    # items without a fitting size are skipped and returned in stats['skipped'].
+    # Identical bearings share their generated shape through bearMaker's shape cache,
+    # with useLinks they become App::Links to one hidden master bearing per parameter set.
+    if doc is None:
+        doc = FreeCAD.ActiveDocument
+    start = time.time()
+    objs = []
+    skipped = []
+    masters = {}
+    if useLinks:
+        masters = bearGetMasters(doc)
+
+    frozen = None
+    if hasattr(doc, 'RecomputesFrozen'):
+        frozen = doc.RecomputesFrozen
+        doc.RecomputesFrozen = True
+    doc.openTransaction("Add Bearings")
+    try:
+        for type, sizeCode, props, target in items:
+            attachTo = None
+            if not isinstance(target, FreeCAD.Placement):
+                attachTo = target
+            if sizeCode == 'auto':
+                sizeCode = bearGetAutoSize(type, attachTo)
+                if sizeCode is None:
+                    skipped.append((type, target))
+                    continue
+            if useLinks:
+                key = bearGetMasterKey(type, sizeCode, props)
+                if key not in masters:
+                    master = doc.addObject("Part::FeaturePython", "bear" + type + "Master")
+                    bearBaseObject(master, type, None, sizeCode, props)
+                    master.Label = type + " master"
+                    if FreeCAD.GuiUp:
+                        bearViewProvider(master.ViewObject)
+                        master.ViewObject.Visibility = False
+                    masters[key] = master
+                obj = doc.addObject("App::LinkPython", "bear" + type)
+                bearLinkObject(obj, masters[key], attachTo)
+            else:
+                obj = doc.addObject("Part::FeaturePython", "bear" + type)
+                bearBaseObject(obj, type, attachTo, sizeCode, props)
+                if FreeCAD.GuiUp:
+                    bearViewProvider(obj.ViewObject)
+            obj.Label = type
+            if attachTo is None and target is not None:
+                obj.Placement = target
+            objs.append(obj)
+    except:
+        # drop the bearings created so far
+        doc.abortTransaction()
+        raise
+    finally:
+        if frozen is not None:
+            doc.RecomputesFrozen = frozen
+    bearPlaceBearings(objs)
+    mid = time.time()
+    doc.recompute()
+    doc.commitTransaction()
+    end = time.time()
+    bearStats.add('create', (mid - start) * 1000, 'bulk')
+    bearStats.add('recompute', (end - mid) * 1000, 'bulk')
+
+    stats = {'count': len(objs),
+             'masters': len(masters),
+             'skipped': skipped,
+             'create': (mid - start) * 1000,
+             'recompute': (end - mid) * 1000,
+             'total': (end - start) * 1000}
+    return objs, stats
+
+
+def bearSimplify(objs=None, doc=None):
+    # replaces parametric bearings (or all of doc) by plain Part::Features. Bearings with
+    # the same parameters become App::Links to one hidden Part::Feature, so their shape is
+    # stored once in the file. Masters of App::Link bearings are dropped once no link
+    # refers to them anymore.
+    if doc is None:
+        doc = FreeCAD.ActiveDocument
+    if objs is None:
+        objs = doc.Objects
+    start = time.time()
+
+    masters = set()
+    for obj in doc.Objects:
+        if hasattr(obj, 'Proxy') and isinstance(obj.Proxy, bearLinkObject) and obj.LinkedObject is not None:
+            masters.add(obj.LinkedObject.Name)
+
+    items = []
+    counts = {}
+    oldMasters = set()
+    for obj in [o for o in objs if bearIsBearing(o) and o.Name not in masters]:
+        source = obj
+        placement = obj.Placement
+        if isinstance(obj.Proxy, bearLinkObject):
+            source = obj.LinkedObject
+            if source is None:
+                continue
+            placement = obj.Placement.multiply(source.Placement)
+            oldMasters.add(source.Name)
+        key = bearMaker.getShapeKey(source)
+        counts[key] = counts.get(key, 0) + 1
+        items.append((obj, source, placement, key))
+
+    shapes = {}
+    newObjs = []
+    doc.openTransaction("Simplify Bearings")
+    try:
+        for obj, source, placement, key in items:
+            if key not in shapes:
+                shape = source.Shape.copy()
+                shape.Placement = FreeCAD.Placement()
+                if counts[key] > 1:
+                    shared = doc.addObject("Part::Feature", "bear" + source.type + "Shape")
+                    shared.Shape = shape
+                    shared.Label = source.Label2 + " shape"
+                    if FreeCAD.GuiUp:
+                        shared.ViewObject.Visibility = False
+                    shape = shared
+                shapes[key] = shape
+
+            if counts[key] > 1:
+                new = doc.addObject("App::Link", obj.Name + "Simple")
+                new.LinkedObject = shapes[key]
+            else:
+                new = doc.addObject("Part::Feature", obj.Name + "Simple")
+                new.Shape = shapes[key]
+            new.Placement = placement
+            label = obj.Label
+            new.Label2 = obj.Label2
+            if FreeCAD.GuiUp:
+                new.ViewObject.Visibility = obj.ViewObject.Visibility
+            group = obj.getParentGroup()
+            if group is not None:
+                group.addObject(new)
+            doc.removeObject(obj.Name)
+            # labels are unique, so the old one is only free after the removal
+            new.Label = label
+            newObjs.append(new)
+
+        for name in oldMasters:
+            master = doc.getObject(name)
+            if master is not None and not any(bearIsBearing(o) for o in master.InList):
+                doc.removeObject(name)
+    except:
+        doc.abortTransaction()
+        raise
+    doc.commitTransaction()
+
+    stats = {'count': len(newObjs),
+             'shapes': len(shapes),
+             'total': (time.time() - start) * 1000}
+    return newObjs, stats
 
 
 #****************************************************************************
@@ -169,10 +478,85 @@ class bearViewProvider:
 #        return None
 
 
-def bearMoveToObject(bearObj, attachToObj):
-    ptn1 = None
+def bearGetAttachRef(fp):
+    try:
+        return [fp.baseObject[0].Name, fp.baseObject[1][0]]
+    except Exception:
+        return None
+
+
+def bearGetAttachment(proxy, fp):
+    try:
+        shape = fp.baseObject[0].Shape.getElement(fp.baseObject[1][0])
+    except:
+        shape = None
+
+    # the stored circle survives topological renaming: if the referenced edge is gone or
+    # became another circle while the original one still exists, use that one instead.
+    # Only done for the reference the circle was stored with, a new baseObject set by
+    # the user is taken as it is.
+    stored = proxy.attachGeometry
+    ref = bearGetAttachRef(fp)
+    if stored is None or ref is None or ref != proxy.attachRef:
+        return shape
+    current = None
+    if shape is not None:
+        current = BearUtils.bearGetCircleData(shape)
+    repaired = proxy.attachRepair
+    proxy.attachRepair = None
+    if BearUtils.bearIsSameCircle(current, stored):
+        return shape
+    baseObj = fp.baseObject[0]
+    try:
+        edgeName = BearUtils.bearGetEdgeIndex(baseObj.Shape).findCircle(stored)
+    except Exception:
+        edgeName = None
+    if edgeName is not None:
+        # baseObject is not changed during the recompute, report the new edge once
+        if edgeName != repaired:
+            FreeCAD.Console.PrintWarning(fp.Label + ": " + ref[1] + " of " + baseObj.Label + " moved to " + edgeName + ", reselect to update the reference\n")
+        proxy.attachRepair = edgeName
+        shape = baseObj.Shape.getElement(edgeName)
+    return shape
+
+
+def bearRecordAttachment(proxy, fp, shape):
+    # the stored circle belongs to the reference it was taken from, see bearGetAttachment.
+    # While a renamed edge is in use the original circle is kept.
+    ref = bearGetAttachRef(fp)
+    if ref != proxy.attachRef:
+        proxy.attachRef = ref
+        proxy.attachRepair = None
+    if proxy.attachRepair is None:
+        proxy.attachGeometry = BearUtils.bearGetCircleData(shape)
+
+
+def bearGetAttachFingerprint(bearObj, attachToObj):
+    # everything bearMoveToObject depends on: center, axis and radius of the attachment plus offset and invert
+    if attachToObj is None:
+        return None
+    values = []
+    if hasattr(attachToObj, 'Curve'):
+        for name in ('Center', 'Axis'):
+            if hasattr(attachToObj.Curve, name):
+                vec = getattr(attachToObj.Curve, name)
+                values += [vec.x, vec.y, vec.z]
+        if hasattr(attachToObj.Curve, 'Radius'):
+            values.append(attachToObj.Curve.Radius)
+    if hasattr(attachToObj, 'Surface') and hasattr(attachToObj.Surface, 'Axis'):
+        vec = attachToObj.Surface.Axis
+        values += [vec.x, vec.y, vec.z]
+    if hasattr(attachToObj, 'Point'):
+        vec = attachToObj.Point
+        values += [vec.x, vec.y, vec.z]
+    values += [bearObj.offset.Value, float(bearObj.invert)]
+    return [round(v, 9) for v in values]
+
+
+def bearGetAttachFrame(attachToObj):
+    # center and axis of the attachment, None if it does not define both
+    pnt1 = None
     axis1 = None
-    axis2 = None
     if hasattr(attachToObj, 'Curve'):
         if hasattr(attachToObj.Curve, 'Center'):
             pnt1 = attachToObj.Curve.Center
@@ -184,30 +568,66 @@ def bearMoveToObject(bearObj, attachToObj):
     if hasattr(attachToObj, 'Point'):
         pnt1 = attachToObj.Point
 
-    if axis1 is not None:
-        if bearObj.invert:
-            axis1 = FreeCAD.Base.Vector(0, 0, 0) - axis1
-
-        pnt1 = pnt1 + axis1 * bearObj.offset.Value
-        axis2 = FreeCAD.Base.Vector(0.0, 0.0, 1.0)
-        axis2Minus = FreeCAD.Base.Vector(0.0, 0.0, -1.0)
+    if pnt1 is None or axis1 is None:
+        return None
+    return pnt1, axis1
 
-        if axis1 == axis2:
-            normvec = FreeCAD.Base.Vector(1.0, 0.0, 0.0)
-            result = 0.0
-        else:
-            if axis1 == axis2Minus:
-                normvec = FreeCAD.Base.Vector(1.0, 0.0, 0.0)
-                result = math.pi
-            else:
-                normvec = axis1.cross(axis2)
-                normvec.normalize()
-                result = DraftVecUtils.angle(axis1, axis2, normvec)
 
-        normvec.multiply(-math.sin(result / 2))
-        pl = FreeCAD.Placement()
-        pl.Rotation = (normvec.x, normvec.y, normvec.z, math.cos(result / 2))
+def bearMoveToObject(bearObj, attachToObj):
+    bearMoveToObjects([bearObj], [attachToObj])
+
+
+def bearMoveToObjects(bearObjs, attachToObjs):
+    # places each bearing on its attachment: Z of the bearing along the axis (inverted by
+    # invert), origin at center + axis * offset. All rotations are computed in one pass as
+    # the quaternion halfway between Z and the axis, (-a.y, a.x, 0, 1 + a.z) normalized,
+    # which degenerates for -Z only; that one is the half turn about X.
+    import numpy
+    objs = []
+    frames = []
+    for bearObj, attachToObj in zip(bearObjs, attachToObjs):
+        frame = bearGetAttachFrame(attachToObj)
+        if frame is not None:
+            objs.append(bearObj)
+            frames.append(frame)
+    if len(objs) == 0:
+        return
 
-        bearObj.Placement = FreeCAD.Placement()
-        bearObj.Placement.Rotation = pl.Rotation.multiply(bearObj.Placement.Rotation)
-        bearObj.Placement.move(pnt1)
+    centers = numpy.array([(p.x, p.y, p.z) for p, a in frames], dtype=float)
+    axes = numpy.array([(a.x, a.y, a.z) for p, a in frames], dtype=float)
+    axes /= numpy.linalg.norm(axes, axis=1)[:, None]
+    signs = numpy.array([-1.0 if obj.invert else 1.0 for obj in objs])
+    offsets = numpy.array([obj.offset.Value for obj in objs])
+    axes *= signs[:, None]
+    points = centers + axes * offsets[:, None]
+
+    quats = numpy.zeros((len(objs), 4))
+    quats[:, 0] = -axes[:, 1]
+    quats[:, 1] = axes[:, 0]
+    quats[:, 3] = 1.0 + axes[:, 2]
+    quats[quats[:, 3] < 1e-12] = (1.0, 0.0, 0.0, 0.0)
+    quats /= numpy.linalg.norm(quats, axis=1)[:, None]
+
+    for obj, pnt, q in zip(objs, points.tolist(), quats.tolist()):
+        obj.Placement = FreeCAD.Placement(FreeCAD.Base.Vector(*pnt), FreeCAD.Rotation(*q))
+
+
+def bearPlaceBearings(objs):
+    # re-places all attached bearings in one batch and records their fingerprints, so their
+    # next execute keeps the placement
+    moveObjs = []
+    moveShapes = []
+    for obj in objs:
+        if not bearIsBearing(obj):
+            continue
+        shape = bearGetAttachment(obj.Proxy, obj)
+        if shape is None:
+            continue
+        fingerprint = bearGetAttachFingerprint(obj, shape)
+        if fingerprint != obj.Proxy.attachFingerprint:
+            moveObjs.append(obj)
+            moveShapes.append(shape)
+            obj.Proxy.attachFingerprint = fingerprint
+        bearRecordAttachment(obj.Proxy, obj, shape)
+    with bearStats.phase('placement'):
+        bearMoveToObjects(moveObjs, moveShapes)
@@ -0,0 +1,144 @@
+# -*- coding: utf-8 -*-
+# ***************************************************************************
+# *   (c) Didier Jud 2023                                                   *
+# *                                                                         *
+# *   This program is free software; you can redistribute it and/or modify  *
+# *   it under the terms of the GNU Lesser General Public License (LGPL)    *
+# *   as published by the Free Software Foundation; either version 2 of     *
+# *   the License, or (at your option) any later version.                   *
+# *   for detail see the LICENCE text file.                                 *
+# *                                                                         *
+# *   This program is distributed in the hope that it will be useful,       *
+# *   but WITHOUT ANY WARRANTY; without even the implied warranty of        *
+# *   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the         *
+# *   GNU Library General Public License for more details.                  *
+# *                                                                         *
+# *   You should have received a copy of the GNU Library General Public     *
+# *   License along with this program; if not, write to the Free Software   *
+# *   Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307  *
+# *   USA                                                                   *
+# *                                                                         *
+# ***************************************************************************
+
+# Benchmark of the generators in BearFunctions, e.g.
+#   python BearBench.py -r 5 -o bench.json --baseline bench_old.json
+# FreeCAD's lib directory has to be on PYTHONPATH (or run it with FreeCADCmd).
+
+import sys
+import time
+import json
+import platform
+import argparse
+
+
+def bearBenchItem(type, sizeCode, props, repeat=3):
+    from BearMaker import bearMaker
+    from BearMaker import bearParams
+    from BearStats import bearStats
+
+    fp = bearParams(type, sizeCode, **props)
+    totals = []
+    phases = {}
+    for i in range(repeat):
+        bearStats.reset()
+        start = time.perf_counter()
+        bearMaker.createBearing(fp, useCache=False)
+        totals.append((time.perf_counter() - start) * 1000)
+        for stage, ms in bearStats.getTotals().items():
+            phases.setdefault(stage, []).append(ms)
+    return {'type': type,
+            'sizeCode': sizeCode,
+            'options': props,
+            'total': min(totals),
+            'mean': sum(totals) / len(totals),
+            'phases': {stage: min(values) for stage, values in phases.items()}}
+
+
+def bearRunBenchmark(types=None, props=None, repeat=3, progress=True):
+    import FreeCAD
+    from BearMaker import bearMaker
+    from BearMaker import bearParams
+    from BearMaker import BEAR_GENERATOR_VERSION
+    from BearStats import bearStats
+    from BearExport import bearGetExportItems
+    from BearExport import bearGetItemName
+
+    items = bearGetExportItems(types, props)
+    enabled = bearStats.enabled
+    bearStats.enabled = True
+    results = []
+    try:
+        warmedUp = set()
+        for type, sizeCode, options in items:
+            name = bearGetItemName(type, sizeCode, options)
+            try:
+                if type not in warmedUp:
+                    bearMaker.createBearing(bearParams(type, sizeCode, **options), useCache=False)
+                    warmedUp.add(type)
+                result = bearBenchItem(type, sizeCode, options, repeat)
+                state = "%.1f ms" % result['total']
+            except Exception as e:
+                result = {'type': type, 'sizeCode': sizeCode, 'options': options, 'error': str(e)}
+                state = "ERROR " + str(e)
+            results.append(result)
+            if progress:
+                print("[%d/%d] %s: %s" % (len(results), len(items), name, state), flush=True)
+    finally:
+        bearStats.enabled = enabled
+        bearStats.reset()
+
+    meta = {'generatorVersion': BEAR_GENERATOR_VERSION,
+            'freecad': ".".join(FreeCAD.Version()[:3]),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'repeat': repeat,
+            'time': time.strftime('%Y-%m-%dT%H:%M:%S')}
+    return {'meta': meta, 'results': results}
+
+
+def bearCompareBenchmarks(current, baseline, threshold=0.1):
+    from BearExport import bearGetItemName
+
+    def byName(bench):
+        return {bearGetItemName(r['type'], r['sizeCode'], r['options']): r for r in bench['results']}
+
+    old = byName(baseline)
+    regressions = []
+    for name, result in sorted(byName(current).items()):
+        if 'total' not in result or name not in old or 'total' not in old[name]:
+            continue
+        if result['total'] > old[name]['total'] * (1.0 + threshold):
+            regressions.append((name, old[name]['total'], result['total']))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the bearing generators")
+    parser.add_argument('-t', '--types', nargs='+', help="bearing types to benchmark (default: all)")
+    parser.add_argument('-d', '--detail', choices=['Full', 'Simplified', 'Envelope'], help="level of detail")
+    parser.add_argument('-r', '--repeat', type=int, default=3, help="runs per item, the fastest is reported")
+    parser.add_argument('-o', '--output', help="write the results as JSON to this file")
+    parser.add_argument('--baseline', help="JSON results of an earlier run to compare against")
+    parser.add_argument('--threshold', type=float, default=0.1, help="relative slow-down reported as regression")
+    args = parser.parse_args(argv)
+
+    props = None
+    if args.detail is not None:
+        props = {'detail': args.detail}
+    bench = bearRunBenchmark(args.types, props, args.repeat)
+    if args.output is not None:
+        with open(args.output, 'w') as fp:
+            json.dump(bench, fp, indent=1)
+
+    if args.baseline is not None:
+        with open(args.baseline) as fp:
+            baseline = json.load(fp)
+        regressions = bearCompareBenchmarks(bench, baseline, args.threshold)
+        for name, old, new in regressions:
+            print("regression %s: %.1f -> %.1f ms" % (name, old, new))
+        return 1 if len(regressions) > 0 else 0
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
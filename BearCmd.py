@@ -26,7 +26,7 @@ import FreeCADGui as Gui
 import BearUtils
 from BearUtils import _iconPath
 import BearBase
-import time
+import BearSelection
 
 class bearModifierCmdList:
     def __init__(self):
@@ -64,19 +64,16 @@ class bearItemCmd:
 
     def Activated(self):
 #        FreeCAD.Console.PrintMessage("bearCmd.Activated() ")
-        start = int(time.time() * 1000)
-        for selObj in BearUtils.bearGetAttachableSelections():
-#            FreeCAD.Console.PrintMessage(selObj)
-#            FreeCAD.Console.PrintMessage("    ")
-            a = FreeCAD.ActiveDocument.addObject("Part::FeaturePython", "bear" + self._type)
-            BearBase.bearBaseObject(a, self._type, selObj)
-            a.Label = self._type
-            BearBase.bearViewProvider(a.ViewObject)
-#        FreeCAD.Console.PrintMessage("\n")
-        mid = int(time.time() * 1000)
-        FreeCAD.ActiveDocument.recompute()
-        end = int(time.time() * 1000)
-        FreeCAD.Console.PrintMessage("execution: " + str(mid - start) + " - " + str(end - start) + " ms\n")
+        sizeCode = None
+        if BearUtils.bearGetParams().GetBool('AutoSize', False):
+            sizeCode = 'auto'
+        items = []
+        for selObj in BearSelection.bearGetAttachableSelections():
+            items.append((self._type, sizeCode if selObj is not None else None, None, selObj))
+        useLinks = BearUtils.bearGetParams().GetBool('UseLinks', False)
+        objs, stats = BearBase.bearMakeBearings(items, useLinks=useLinks)
+        if len(stats['skipped']) > 0:
+            FreeCAD.Console.PrintWarning(str(len(stats['skipped'])) + " of " + str(len(items)) + " bearings not added, no fitting size\n")
         return
 
     def IsActive(self):
@@ -112,7 +109,7 @@ class BearFlip:
         bearObj = []
         for selObj in Gui.Selection.getSelectionEx():
             obj = selObj.Object
-            if hasattr(obj, 'Proxy') and isinstance(obj.Proxy, BearBase.bearBaseObject):
+            if BearBase.bearIsBearing(obj):
                 if obj.baseObject is not None:
                     bearObj.append(obj)
         return bearObj
@@ -150,9 +147,9 @@ class BearMove:
         edgeObj = None
         for selObj in Gui.Selection.getSelectionEx():
             obj = selObj.Object
-            if hasattr(obj, 'Proxy') and isinstance(obj.Proxy, BearBase.bearBaseObject):
+            if BearBase.bearIsBearing(obj):
                 bearObj = obj
-        aselects = BearUtils.bearGetAttachableSelections()
+        aselects = BearSelection.bearGetAttachableSelections()
         if len(aselects) > 0:
             edgeObj = aselects[0]
         return bearObj, edgeObj
@@ -161,6 +158,23 @@ Gui.addCommand("BearMove", BearMove())
 bearModifierCmd.append("BearMove")
 
 
+class BearSelectBores:
+    def GetResources(self):
+        return {'Pixmap': os.path.join(_iconPath, 'IconSelectBores.svg'),
+                'MenuText': 'Select Bores',
+                'ToolTip': 'Add all bores with the diameter of the selected circle to the selection'}
+
+    def IsActive(self):
+        return FreeCAD.ActiveDocument is not None and len(Gui.Selection.getSelectionEx()) > 0
+
+    def Activated(self):
+        BearSelection.bearSelectBores()
+        return
+
+Gui.addCommand("BearSelectBores", BearSelectBores())
+bearModifierCmd.append("BearSelectBores")
+
+
 class BearSimplify:
     def GetResources(self):
         return {'Pixmap': os.path.join(_iconPath, 'IconSimplify.svg'),
@@ -168,13 +182,21 @@ class BearSimplify:
                 'ToolTip': 'Convert Bearing to non-paramteric part'}
 
     def IsActive(self):
-        return False
-#        if not FreeCAD.ActiveDocument:
-#            return False
-#        return True
+        return FreeCAD.ActiveDocument is not None
 
     def Activated(self):
-        FreeCAD.Console.PrintMessage("Simplify Bearing\n")
+        objs = self.GetSelection()
+        if len(objs) == 0:
+            objs = None     # whole document
+        BearBase.bearSimplify(objs)
+        return
+
+    def GetSelection(self):
+        bearObj = []
+        for selObj in Gui.Selection.getSelectionEx():
+            if BearBase.bearIsBearing(selObj.Object):
+                bearObj.append(selObj.Object)
+        return bearObj
 
 Gui.addCommand("BearSimplify", BearSimplify())
 bearModifierCmd.append("BearSimplify")
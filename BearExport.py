@@ -0,0 +1,136 @@
+# -*- coding: utf-8 -*-
+# ***************************************************************************
+# *   (c) Didier Jud 2023                                                   *
+# *                                                                         *
+# *   This program is free software; you can redistribute it and/or modify  *
+# *   it under the terms of the GNU Lesser General Public License (LGPL)    *
+# *   as published by the Free Software Foundation; either version 2 of     *
+# *   the License, or (at your option) any later version.                   *
+# *   for detail see the LICENCE text file.                                 *
+# *                                                                         *
+# *   This program is distributed in the hope that it will be useful,       *
+# *   but WITHOUT ANY WARRANTY; without even the implied warranty of        *
+# *   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the         *
+# *   GNU Library General Public License for more details.                  *
+# *                                                                         *
+# *   You should have received a copy of the GNU Library General Public     *
+# *   License along with this program; if not, write to the Free Software   *
+# *   Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307  *
+# *   USA                                                                   *
+# *                                                                         *
+# ***************************************************************************
+
+# Batch export of the whole catalog, e.g.
+#   python BearExport.py -o /tmp/bearings -f step stl -j 32
+# FreeCAD's lib directory has to be on PYTHONPATH (or run it with FreeCADCmd).
+
+import os
+import sys
+import time
+import argparse
+import multiprocessing
+
+_bearMaker = None
+
+
+def bearGetExportItems(types=None, props=None):
+    from BearUtils import bearItemsTable
+    from BearMaker import bearMaker
+
+    items = []
+    for type in bearItemsTable:
+        if types is not None and type not in types:
+            continue
+        for sizeCode in bearMaker.getAllSizeCodes(type):
+            for options in bearMaker.getOptionCombinations(type, sizeCode):
+                if props is not None:
+                    options.update(props)
+                items.append((type, sizeCode, options))
+    return items
+
+
+def bearGetItemName(type, sizeCode, props):
+    name = type + "_" + sizeCode
+    for prop in sorted(props):
+        value = str(props[prop])
+        if value != '-':
+            name += "_" + prop + "-" + value
+    return "".join(c if c.isalnum() or c in '-_.' else '_' for c in name)
+
+
+def _bearWorkerInit(paths):
+    global _bearMaker
+    for path in reversed(paths):
+        if path not in sys.path:
+            sys.path.insert(0, path)
+    import FreeCAD
+    from BearMaker import bearMaker
+    # load the catalog and import the generators here, not in the timing of the first items
+    bearMaker.warmUp()
+    _bearMaker = bearMaker
+
+
+def _bearExportItem(args):
+    from BearMaker import bearParams
+    (type, sizeCode, props), outDir, formats = args
+    name = bearGetItemName(type, sizeCode, props)
+    start = time.time()
+    try:
+        # no shape cache, but rings and rolling elements are shared between the items of a worker
+        shape = _bearMaker.makeBearing(bearParams(type, sizeCode, **props))
+        for fmt in formats:
+            fileName = os.path.join(outDir, name + "." + fmt)
+            if fmt == 'step':
+                shape.exportStep(fileName)
+            elif fmt == 'brep':
+                shape.exportBrep(fileName)
+            elif fmt == 'stl':
+                shape.exportStl(fileName)
+        error = None
+    except Exception as e:
+        error = str(e)
+    return name, (time.time() - start) * 1000, error
+
+
+def bearExportCatalog(outDir, formats=('step',), types=None, props=None, processes=None, progress=True):
+    os.makedirs(outDir, exist_ok=True)
+    items = bearGetExportItems(types, props)
+    paths = [os.path.dirname(os.path.abspath(__file__))] + sys.path
+
+    results = []
+    start = time.time()
+    ctx = multiprocessing.get_context('spawn')
+    with ctx.Pool(processes, initializer=_bearWorkerInit, initargs=(paths,)) as pool:
+        jobs = [(item, outDir, formats) for item in items]
+        for name, ms, error in pool.imap_unordered(_bearExportItem, jobs):
+            results.append((name, ms, error))
+            if progress:
+                state = "ERROR " + error if error is not None else "%.0f ms" % ms
+                print("[%d/%d] %s: %s" % (len(results), len(items), name, state), flush=True)
+    if progress:
+        failed = sum(1 for r in results if r[2] is not None)
+        print("exported %d items (%d failed) in %.1f s" % (len(results) - failed, failed, time.time() - start))
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Export every bearing of the catalog")
+    parser.add_argument('-o', '--output', required=True, help="output directory")
+    parser.add_argument('-f', '--formats', nargs='+', default=['step'], choices=['step', 'brep', 'stl'])
+    parser.add_argument('-t', '--types', nargs='+', help="bearing types to export (default: all)")
+    parser.add_argument('-d', '--detail', choices=['Full', 'Simplified', 'Envelope'], help="level of detail")
+    parser.add_argument('-j', '--processes', type=int, help="number of worker processes (default: cpu count)")
+    parser.add_argument('--python', help="interpreter for the workers, if sys.executable cannot run them")
+    args = parser.parse_args(argv)
+
+    if args.python is not None:
+        multiprocessing.set_executable(args.python)
+    props = None
+    if args.detail is not None:
+        props = {'detail': args.detail}
+    results = bearExportCatalog(args.output, args.formats, args.types, props, args.processes)
+    return 1 if any(r[2] is not None for r in results) else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -22,10 +22,10 @@
 
 import FreeCAD
 import Part
-import Draft
 import math
 from BearMaker import *
 import BearUtils
+from BearStats import bearStats
 
 T_CAGE = 0.2
 DEPTH_SHIELD = 0.2
@@ -52,6 +52,10 @@ def MakeBaseAxialBearing(self, fp):
     R2ins = D2inside / 2
     Rs = Ds / 2
 
+    detail = BearUtils.bearGetDetail(fp)
+    if detail == 'Envelope':
+        return BearUtils.bearMakeTube(r1, R2, 0.0, b)
+
     dRr = (R2ins - r1ins)/2
     rBall = dBall / 2
     hBall = math.sqrt(rBall*rBall - dRr*dRr)
@@ -99,24 +103,22 @@ def MakeBaseAxialBearing(self, fp):
     fm.addPoint(r1+Rs, 0.0)
     fm.addArc2(0.0, Rs, -90)
 #    shape = fm.revolveZ(fm.getFace)
-    face = fm.getFace()
 #    FreeCAD.Console.PrintMessage(face.__dir__())
 #    FreeCAD.Console.PrintMessage("\n")
-    shape = face.revolve(FreeCAD.Base.Vector(0, 0, 0), FreeCAD.Base.Vector(0, 0, 1), 360)
+    shape = fm.getRevolved()
+
+    if detail == 'Simplified':
+        return shape
 
     if B1 == 0.0 or not hasattr(fp, 'shield') or (hasattr(fp, 'shield') and (fp.shield != '2Z' or fp.shield != '2RS')):     # draw balls
-        angle = 2 * math.pi / nBall
         radius = (R2ins + r1ins) / 2
-        balls = []
-        for n in range(nBall):
-            xp = radius * math.cos(n * angle)
-            yp = radius * math.sin(n * angle)
-            ball = Part.makeSphere(rBall+T_CAGE)
-            ball.Placement.Base.x = xp
-            ball.Placement.Base.y = yp
-            ball.Placement.Base.z = b / 2
-            balls.append(ball)
-
-        shape = shape.fuse(balls)
+        with bearStats.phase('elements'):
+            balls = BearUtils.bearPolarPattern('ball', (rBall+T_CAGE, radius, b / 2), nBall)
+
+        if BearUtils.bearGetOutputMode(fp) == 'Compound':
+            shape = Part.makeCompound([shape] + balls.Solids)
+        else:
+            with bearStats.phase('boolean'):
+                shape = shape.fuse(balls)
 
     return shape
\ No newline at end of file
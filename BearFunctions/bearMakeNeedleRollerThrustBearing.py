@@ -26,6 +26,7 @@ import Part
 #import math
 from BearMaker import *
 import BearUtils
+from BearStats import bearStats
 
 
 def MakeNeedleRollerThrustBearing(self, fp):
@@ -43,9 +44,12 @@ def MakeNeedleRollerThrustBearing(self, fp):
     w_R1 = w_D1 / 2
 
     centerNeedle = rNeedle
+    detail = BearUtils.bearGetDetail(fp)
 
     botWshape = None
     topWshape = None
+    zBottom = None
+    zTop = None
 
     if hasattr(fp, 'bottomWasher'):
         botW = BearUtils.bearFaceMaker()
@@ -58,7 +62,9 @@ def MakeNeedleRollerThrustBearing(self, fp):
             centerNeedle += 1.0
             botW.addPoints((w_r, 0.0),(w_r, 1.0),(w_R, 1.0), (w_R, 0.0))
         if botW.hasShape():
-            botWshape = botW.getFace().revolve(FreeCAD.Base.Vector(0, 0, 0), FreeCAD.Base.Vector(0, 0, 1), 360)
+            zBottom = 0.0
+        if botW.hasShape() and detail != 'Envelope':
+            botWshape = botW.getRevolved()
 
     if hasattr(fp, 'topWasher'):
         topWbase = centerNeedle + rNeedle
@@ -66,26 +72,55 @@ def MakeNeedleRollerThrustBearing(self, fp):
 
         attrib = str(getattr(fp, 'topWasher'))
         if attrib == 'LS':
+            zTop = topWbase + w_B
             topW.addPoints((w_r, topWbase), (w_r, topWbase + w_B - w_r12), (w_r + w_r12, topWbase + w_B),(w_R - w_r12, topWbase + w_B),(w_R, topWbase + w_B - w_r12),(w_R, topWbase))
         if attrib == 'AS':
+            zTop = topWbase + 1.0
             topW.addPoints((w_r, topWbase), (w_r, topWbase + 1.0),(w_R, topWbase + 1.0),(w_R, topWbase))
-        if topW.hasShape():
-            topWshape = topW.getFace().revolve(FreeCAD.Base.Vector(0, 0, 0), FreeCAD.Base.Vector(0, 0, 1), 360)
+        if topW.hasShape() and detail != 'Envelope':
+            topWshape = topW.getRevolved()
 
-    needles = []
+    if detail == 'Envelope':
+        rOut = R2
+        if zBottom is None:
+            zBottom = centerNeedle - max(Bw/2, rNeedle)
+        else:
+            rOut = max(rOut, w_R)
+        if zTop is None:
+            zTop = centerNeedle + max(Bw/2, rNeedle)
+        else:
+            rOut = max(rOut, w_R)
+        return BearUtils.bearMakeTube(r1, rOut, zBottom, zTop)
+
+    needles = None
     lenNeedle = (Eb - Ea) / 2
     angle = 360 / nNeedleFloat
 
-    needle = Part.makeCylinder(rNeedle, lenNeedle, FreeCAD.Base.Vector(Ea/2, 0.0, centerNeedle),FreeCAD.Base.Vector(1, 0, 0), 360)
-    for n in range(nNeedle):
-        needles.append(needle.rotated(FreeCAD.Base.Vector(0, 0, 0), FreeCAD.Base.Vector(0, 0, 1), n * angle))
-    shape = Part.makeCylinder(R2, Bw, FreeCAD.Base.Vector(0.0, 0.0, centerNeedle - Bw/2))#, FreeCAD.Base.Vector(0, 0, 1), 360)
-    shape = shape.cut(Part.makeCylinder(r1, Bw, FreeCAD.Base.Vector(0.0, 0.0, centerNeedle - Bw/2)))#, FreeCAD.Base.Vector(0, 0, 1), 360))
-    shape = shape.fuse(needles)
-
-    if botWshape != None:
-        shape = shape.fuse(botWshape)
-    if topWshape != None:
-        shape = shape.fuse(topWshape)
+    if detail == 'Full' and nNeedle > 0:
+        with bearStats.phase('elements'):
+            needles = BearUtils.bearPolarPattern('needle', (rNeedle, lenNeedle, Ea/2, centerNeedle), nNeedle, angle)
+
+    cage = BearUtils.bearFaceMaker()
+    cage.addPoints((r1, centerNeedle - Bw/2), (R2, centerNeedle - Bw/2), (R2, centerNeedle + Bw/2), (r1, centerNeedle + Bw/2))
+    shape = cage.getRevolved()
+
+    if BearUtils.bearGetOutputMode(fp) == 'Compound':
+        parts = [shape]
+        if needles != None:
+            parts += needles.Solids
+        if botWshape != None:
+            parts.append(botWshape)
+        if topWshape != None:
+            parts.append(topWshape)
+        return Part.makeCompound(parts)
+
+    with bearStats.phase('boolean'):
+        if needles != None:
+            shape = shape.fuse(needles)
+
+        if botWshape != None:
+            shape = shape.fuse(botWshape)
+        if topWshape != None:
+            shape = shape.fuse(topWshape)
 
     return shape
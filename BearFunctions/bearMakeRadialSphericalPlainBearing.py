@@ -26,6 +26,7 @@ import Part
 import math
 from BearMaker import *
 import BearUtils
+from BearStats import bearStats
 
 def MakeRadialSphericalPlainBearing(self, fp):
 #    FreeCAD.Console.PrintMessage("makeBaseAxialBearing()\n")
@@ -44,6 +45,10 @@ def MakeRadialSphericalPlainBearing(self, fp):
     rs = math.sqrt(rk*rk - B2*B2)
     rsC = math.sqrt(rk*rk - (C2-r1)*(C2-r1))
 
+    # a plain bearing has no rolling elements, 'Simplified' equals 'Full'
+    if BearUtils.bearGetDetail(fp) == 'Envelope':
+        return BearUtils.bearMakeTube(r, R, C2-B2, C2+B2)
+
     fm = BearUtils.bearFaceMaker()
 #    fm.addPoint(r, B2-r1)
 #    fm.addArc2(r1, 0.0, -90)
@@ -57,7 +62,7 @@ def MakeRadialSphericalPlainBearing(self, fp):
     fm.addPoint(r, -B2+C2)
 
 #    shape1 = fm.getFace().revolve(FreeCAD.Base.Vector(0, 0, 0), FreeCAD.Base.Vector(0, 0, 1), 360)
-    shape1 = fm.revolveZ(fm.getFace())
+    shape1 = fm.getRevolved()
 
     fm.reset()
 #    fm.addPoint(rsC, C2-r1)
@@ -76,9 +81,13 @@ def MakeRadialSphericalPlainBearing(self, fp):
     fm.addArc2(0.0, r1, -90)
 
 #    shape2 = fm.getFace().revolve(FreeCAD.Base.Vector(0, 0, 0), FreeCAD.Base.Vector(0, 0, 1), 360)
-    shape2 = fm.revolveZ(fm.getFace())
+    shape2 = fm.getRevolved()
 
-    shape = shape1.fuse(shape2)
+    if BearUtils.bearGetOutputMode(fp) == 'Compound':
+        shape = Part.makeCompound([shape1, shape2])
+    else:
+        with bearStats.phase('boolean'):
+            shape = shape1.fuse(shape2)
 #    shape0 = shape1.fuse(shape2)
 #    shape = shape0.removeSplitter()
 
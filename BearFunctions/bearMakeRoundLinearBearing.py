@@ -32,6 +32,10 @@ def MakeRoundLinearBearing(self, fp):
     r1o = D1 / 2
     LB2 = (L - B) / 2
 
+    # no rolling elements are modelled, 'Simplified' equals 'Full'
+    if BearUtils.bearGetDetail(fp) == 'Envelope':
+        return BearUtils.bearMakeTube(ri, ro, 0.0, L)
+
     fm = BearUtils.bearFaceMaker()
     fm.addPoints((ro-a, 0.0),
                  (ro, b))
@@ -58,6 +62,5 @@ def MakeRoundLinearBearing(self, fp):
                  (ri+a, b),
                  (ro-2*a, b),
                  (ro-2*a, 0.0))
-    face = fm.getFace()
-    shape = face.revolve(FreeCAD.Base.Vector(0, 0, 0), FreeCAD.Base.Vector(0, 0, 1), 360)
+    shape = fm.getRevolved()
     return shape
\ No newline at end of file
@@ -21,32 +21,166 @@
 # ***************************************************************************
 
 import FreeCAD
+import Part
 import importlib
+import hashlib
+import itertools
+import os
+import threading
 from pathlib import Path
-from BearUtils import _dataPath
-from BearUtils import csv2dict
+from BearUtils import _functionsPath
+from BearUtils import bearGetParams
+from BearUtils import bearGetCachePath
+from BearUtils import bearCatalog
 from BearUtils import bearItemsTable
+from BearUtils import bearShapeParams
+from BearUtils import bearLRUCache
+from BearUtils import bearResetShapeCaches
+
+# bump whenever a generator in BearFunctions or a shape helper in BearUtils changes its
+# geometry, so cached shapes get invalid
+BEAR_GENERATOR_VERSION = 2
+SHAPE_CACHE_SIZE = 256
+
+
+class bearBrepCache:
+
+    def __init__(self, path, enabled=False):
+        self.path = path
+        self.enabled = enabled
+        self.sourceHash = None
+        self.hits = 0
+        self.misses = 0
+
+    def getSourceHash(self):
+        if self.sourceHash is None:
+            sha = hashlib.sha1()
+            # the generators and BearUtils, which builds their profiles, rings and rolling elements
+            files = sorted(Path(_functionsPath).glob('bear*.py'))
+            files.append(Path(_functionsPath).parent / 'BearUtils.py')
+            for file in files:
+                sha.update(file.name.encode())
+                sha.update(file.read_bytes())
+            self.sourceHash = sha.hexdigest()
+        return self.sourceHash
+
+    def getKey(self, rows, famProps):
+        data = repr((rows, famProps, BEAR_GENERATOR_VERSION, self.getSourceHash()))
+        return hashlib.sha1(data.encode()).hexdigest()
+
+    def getFileName(self, key):
+        return os.path.join(self.path, key + '.brep')
+
+    def get(self, key):
+        fileName = self.getFileName(key)
+        if not os.path.isfile(fileName):
+            self.misses += 1
+            return None
+        try:
+            shape = Part.Shape()
+            shape.importBrep(fileName)
+        except Exception:
+            FreeCAD.Console.PrintWarning("Bearing cache: could not read " + fileName + "\n")
+            self.misses += 1
+            return None
+        self.hits += 1
+        return shape
+
+    def put(self, key, shape):
+        fileName = self.getFileName(key)
+        tmpName = fileName + '.' + str(os.getpid()) + '.tmp'
+        try:
+            os.makedirs(self.path, exist_ok=True)
+            shape.exportBrep(tmpName)
+            os.replace(tmpName, fileName)
+        except Exception:
+            FreeCAD.Console.PrintWarning("Bearing cache: could not write " + fileName + "\n")
+
+    def clear(self):
+        for file in Path(self.path).glob('*.brep'):
+            file.unlink()
+        self.hits = 0
+        self.misses = 0
+
+    def stats(self):
+        return {'path': self.path, 'enabled': self.enabled, 'hits': self.hits, 'misses': self.misses}
+
+
+# stand-in for a bearing object when generating shapes without a document
+class bearParams:
+
+    def __init__(self, type, sizeCode, **props):
+        self.type = type
+        self.sizeCode = sizeCode
+        for prop, value in props.items():
+            setattr(self, prop, value)
+
+    def __repr__(self):
+        return "bearParams(" + ", ".join(key + "=" + repr(value) for key, value in self.__dict__.items()) + ")"
+
+
+class bearGeneratorRegistry:
+
+    def __init__(self):
+        self.generators = {}
+        self.lock = threading.Lock()
+
+    def register(self, name, function):
+        self.generators[name] = function
+
+    def load(self, name):
+        with self.lock:
+            if name not in self.generators:
+                module = importlib.import_module("BearFunctions.bear" + name)
+                self.generators[name] = getattr(module, name)
+            return self.generators[name]
+
+    def get(self, name):
+        function = self.generators.get(name)
+        if function is None:
+            function = self.load(name)
+        return function
+
+    def warmUp(self):
+        for name in set(item[3] for item in bearItemsTable.values()):
+            try:
+                self.get(name)
+            except Exception as e:
+                FreeCAD.Console.PrintError("Error! loading Bearing function " + name + ": " + str(e) + "\n")
+
 
 class bearMakerClass():
-    bearData = {}
-    bearTitles = {}
-    fileList = {}
+    bearData = bearCatalog.data
+    bearTitles = bearCatalog.titlesView
 
     def __init__(self):
         self.objAvailable = True
-        self.fileList = Path(_dataPath).glob('*.csv')
-
-        for file in self.fileList:
-            tables = csv2dict(str(file), file.stem, fieldNamed=True)
-            for tableName in tables.keys():
-                if tableName == 'titles':
-                    self.bearTitles.update(tables[tableName])
-                else:
-                    self.bearData[tableName] = tables[tableName]
+        self.shapeCache = bearLRUCache(SHAPE_CACHE_SIZE)
+        self.generators = bearGeneratorRegistry()
+        self.diskCache = bearBrepCache(bearGetCachePath(), bearGetParams().GetBool('DiskCache', False))
 
     def getAllSizeCodes(self, type):
         return list(self.bearData[type + '_def'].keys())
 
+    def getColumnTable(self, type):
+        return bearCatalog.getColumnTable(type)
+
+    def findSizeCode(self, type, diameter, fit='auto', tol=0.05):
+        # the first two columns of every _def table are bore and outside diameter
+        table = self.getColumnTable(type)
+        columns = {'bore': [table.titles[0]], 'outer': [table.titles[1]], 'auto': [table.titles[1], table.titles[0]]}[fit]
+        best = None
+        for column in columns:
+            found = table.nearest(column, diameter, 1, **{column: (diameter - tol, diameter + tol)})
+            if len(found) == 0:
+                continue
+            error = abs(self.bearData[type + '_def'][found[0]][table.titles.index(column)] - diameter)
+            if best is None or error < best[1]:
+                best = (found[0], error)
+        if best is None:
+            return None
+        return best[0]
+
     def getParamItems(self, type, prop, propType, sizeCode):
         typekey = type + '_' + prop
 #        FreeCAD.Console.PrintMessage(typekey + "\n")
@@ -56,20 +190,58 @@ class bearMakerClass():
         else:
             return None
 
-    def createBearing(self, fp):
-        function = bearItemsTable[fp.type][3]
+    def getOptionCombinations(self, type, sizeCode):
+        props = []
+        values = []
+        for prop, propType in bearItemsTable[type][2].items():
+            items = self.getParamItems(type, prop, propType, sizeCode)
+            if items is not None:
+                props.append(prop)
+                values.append(items)
+        return [dict(zip(props, combination)) for combination in itertools.product(*values)]
 
-        try:
-            if not hasattr(self, function):
-                setattr(bearMakerClass, function, getattr(importlib.import_module("BearFunctions.bear"+function), function))
-        except ValueError:
-            FreeCAD.Console.PrintMessage("Error! loading custom Bearing function!\n")
+    def getCatalogRows(self, type, sizeCode):
+        rows = []
+        for tableName in sorted(bearCatalog.getTableNames(type)):
+            if sizeCode in self.bearData[tableName]:
+                rows.append((tableName, self.bearData[tableName][sizeCode]))
+        return tuple(rows)
+
+    def getShapeKey(self, fp):
+        famProps = tuple((prop, str(getattr(fp, prop, None))) for prop in bearItemsTable[fp.type][2])
+        shapeProps = tuple((prop, str(getattr(fp, prop, items[0]))) for prop, (desc, items) in bearShapeParams.items())
+        return (fp.type, fp.sizeCode, famProps, shapeProps, BEAR_GENERATOR_VERSION)
+
+    def createBearing(self, fp, useCache=True):
+        if not useCache:
+            # also bypass the ring and element caches of BearUtils, so generation is done in full
+            bearResetShapeCaches()
+            return self.makeBearing(fp)
+
+        key = self.getShapeKey(fp)
+        bearShape = self.shapeCache.get(key)
+        if bearShape is None:
+            if self.diskCache.enabled:
+                diskKey = self.diskCache.getKey(self.getCatalogRows(fp.type, fp.sizeCode), key[2:4])
+                bearShape = self.diskCache.get(diskKey)
+                if bearShape is None:
+                    bearShape = self.makeBearing(fp)
+                    self.diskCache.put(diskKey, bearShape)
+            else:
+                bearShape = self.makeBearing(fp)
+            self.shapeCache.put(key, bearShape)
+        return bearShape.copy()
+
+    def makeBearing(self, fp):
+        # generators may return shapes shared through the BearUtils caches
+        return self.generators.get(bearItemsTable[fp.type][3])(self, fp).copy()
 
-        if function != '':
-            function = "self." + function + "(fp)"
-            bearShape = eval(function)
+    def registerGenerator(self, name, function):
+        self.generators.register(name, function)
 
-        return bearShape
+    def warmUp(self):
+        bearCatalog.loadAll()
+        self.generators.warmUp()
 
 
 bearMaker = bearMakerClass()
\ No newline at end of file
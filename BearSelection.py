@@ -0,0 +1,94 @@
+# -*- coding: utf-8 -*-
+# ***************************************************************************
+# *   (c) Didier Jud 2023                                                   *
+# *                                                                         *
+# *   This program is free software; you can redistribute it and/or modify  *
+# *   it under the terms of the GNU Lesser General Public License (LGPL)    *
+# *   as published by the Free Software Foundation; either version 2 of     *
+# *   the License, or (at your option) any later version.                   *
+# *   for detail see the LICENCE text file.                                 *
+# *                                                                         *
+# *   This program is distributed in the hope that it will be useful,       *
+# *   but WITHOUT ANY WARRANTY; without even the implied warranty of        *
+# *   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the         *
+# *   GNU Library General Public License for more details.                  *
+# *                                                                         *
+# *   You should have received a copy of the GNU Library General Public     *
+# *   License along with this program; if not, write to the Free Software   *
+# *   Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307  *
+# *   USA                                                                   *
+# *                                                                         *
+# ***************************************************************************
+
+import FreeCAD
+import FreeCADGui as Gui
+import Part
+import BearUtils
+
+
+def bearGetAttachableSelections():
+    asels = []
+    for selObj in Gui.Selection.getSelectionEx():
+        baseObjectNames = selObj.SubElementNames
+        obj = selObj.Object
+        grp = obj.getParentGeoFeatureGroup()
+        if grp is not None and hasattr(grp, 'TypeId') and grp.TypeId == "PartDesign::Body":
+            obj = grp
+
+        posDone = BearUtils.bearCircleGrid()
+
+        for bObjN in baseObjectNames:
+            shape = obj.Shape.getElement(bObjN)
+
+            if hasattr(shape, 'Curve'):
+                if not hasattr(shape.Curve, 'Center'):
+                    continue
+                if not hasattr(shape.Curve, 'Radius'):
+                    continue
+                if posDone.contains(shape.Curve.Center, shape.Curve.Radius):
+                    continue
+                asels.append((obj, [bObjN]))
+                posDone.add(shape.Curve.Center, shape.Curve.Radius)
+#                FreeCAD.Console.PrintMessage("Linking to " + obj.Name + "[" + bObjN + "]\n")
+
+            elif isinstance(shape, Part.Face):
+                edgeIndex = BearUtils.bearGetEdgeIndex(obj.Shape)
+                outerEdges = BearUtils.bearEdgeIndex(shape.OuterWire)
+                for edge in shape.Edges:
+                    if not hasattr(edge, 'Curve'):
+                        continue
+                    if not hasattr(edge.Curve, 'Center'):
+                        continue
+                    if not hasattr(edge.Curve, 'Radius'):
+                        continue
+                    if posDone.contains(edge.Curve.Center, edge.Curve.Radius):
+                        continue
+                    if outerEdges.getName(edge) is not None:
+                        continue
+                    edgeName = edgeIndex.getName(edge)
+                    if edgeName is None:
+                        continue
+                    asels.append((obj, [edgeName]))
+                    posDone.add(edge.Curve.Center, edge.Curve.Radius)
+#                    FreeCAD.Console.PrintMessage("Linking to " + "[" + edgeName + "[\n")
+
+    if len(asels) == 0:
+        asels.append(None)
+    return asels
+
+
+def bearSelectBores(tol=1e-6):
+    # extend the selection by every bore of the selected circles' diameters in the same body
+    count = 0
+    for sel in bearGetAttachableSelections():
+        if sel is None:
+            continue
+        obj, names = sel
+        data = BearUtils.bearGetCircleData(obj.Shape.getElement(names[0]))
+        if data is None:
+            continue
+        for bore, boreNames in BearUtils.bearGetBores(obj, 2 * data[6], tol):
+            Gui.Selection.addSelection(bore, boreNames)
+            count += 1
+    return count
+
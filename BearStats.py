@@ -0,0 +1,84 @@
+# -*- coding: utf-8 -*-
+# ***************************************************************************
+# *   (c) Didier Jud 2023                                                   *
+# *                                                                         *
+# *   This program is free software; you can redistribute it and/or modify  *
+# *   it under the terms of the GNU Lesser General Public License (LGPL)    *
+# *   as published by the Free Software Foundation; either version 2 of     *
+# *   the License, or (at your option) any later version.                   *
+# *   for detail see the LICENCE text file.                                 *
+# *                                                                         *
+# *   This program is distributed in the hope that it will be useful,       *
+# *   but WITHOUT ANY WARRANTY; without even the implied warranty of        *
+# *   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the         *
+# *   GNU Library General Public License for more details.                  *
+# *                                                                         *
+# *   You should have received a copy of the GNU Library General Public     *
+# *   License along with this program; if not, write to the Free Software   *
+# *   Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307  *
+# *   USA                                                                   *
+# *                                                                         *
+# ***************************************************************************
+
+import json
+import time
+from contextlib import contextmanager
+
+
+class bearStatsClass:
+
+    def __init__(self):
+        self.enabled = False
+        self.group = ''
+        self.reset()
+
+    def reset(self):
+        self.records = {}
+
+    def add(self, stage, ms, group=None):
+        if not self.enabled:
+            return
+        if group is None:
+            group = self.group
+        record = self.records.setdefault((group, stage), [0, 0.0, 0.0])
+        record[0] += 1
+        record[1] += ms
+        record[2] = max(record[2], ms)
+
+    @contextmanager
+    def phase(self, stage, group=None):
+        if not self.enabled:
+            yield
+            return
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(stage, (time.perf_counter() - start) * 1000, group)
+
+    def getTotals(self, group=None):
+        totals = {}
+        for (grp, stage), (count, total, maximum) in self.records.items():
+            if group is None or grp == group:
+                totals[stage] = totals.get(stage, 0.0) + total
+        return totals
+
+    def getRecords(self):
+        records = []
+        for (group, stage), (count, total, maximum) in sorted(self.records.items()):
+            records.append({'group': group, 'stage': stage, 'count': count,
+                            'total': total, 'mean': total / count, 'max': maximum})
+        return records
+
+    def report(self):
+        lines = ["%-12s %-16s %8s %12s %10s %10s" % ('group', 'stage', 'count', 'total ms', 'mean ms', 'max ms')]
+        for r in self.getRecords():
+            lines.append("%-12s %-16s %8d %12.1f %10.2f %10.2f" % (r['group'], r['stage'], r['count'], r['total'], r['mean'], r['max']))
+        return "\n".join(lines)
+
+    def dump(self, fileName):
+        with open(fileName, 'w') as fp:
+            json.dump(self.getRecords(), fp, indent=1)
+
+
+bearStats = bearStatsClass()
@@ -21,22 +21,51 @@
 # ***************************************************************************
 
 import FreeCAD
-import FreeCADGui as Gui
 import Part
 import os
 import csv
 import math
+import pickle
+import time
+import threading
+from collections import OrderedDict
+from collections.abc import Mapping
 from pathlib import Path
+from BearStats import bearStats
 
 
 _dir = os.path.dirname(__file__)
 _iconPath = os.path.join(_dir, 'Icons')
 _dataPath = os.path.join(_dir, 'Data')
+_functionsPath = os.path.join(_dir, 'BearFunctions')
+_paramPath = "User parameter:BaseApp/Preferences/Mod/Bearing"
+
+REVOLVE_CACHE_SIZE = 512
+ELEMENT_CACHE_SIZE = 256
+
+
+def bearGetParams():
+    return FreeCAD.ParamGet(_paramPath)
+
+
+bearStats.enabled = bearGetParams().GetBool('Instrumentation', False)
+
+
+def bearGetCachePath():
+    if hasattr(FreeCAD, 'getUserCachePath'):
+        return os.path.join(FreeCAD.getUserCachePath(), 'Bearing')
+    return os.path.join(FreeCAD.getUserAppDataDir(), 'Bearing', 'cache')
 
 noneParams = {}
 baseAxialParams = {'shield':'Enumeration'}
 needleRollerThrustParams = {'bottomWasher':'Enumeration','topWasher':'Enumeration'}
 
+# properties of every bearing which change the generated shape: name -> (description, enumeration items)
+bearShapeParams = {
+    'outputMode': ("Fuse the bearing parts into one solid or keep them as compound", ['Fused', 'Compound']),
+    'detail': ("Level of detail: full geometry, rings without rolling elements or outer envelope only", ['Full', 'Simplified', 'Envelope']),
+}
+
 bearFamilies = {
     'AxialFamily': {'desc': "axial Bearings",},
     'RadialFamily': {'desc': "radial Bearings",},
@@ -60,74 +89,24 @@ for item in bearItemsTable:
         bearFamilies[famName]['items'].append(str(item))
 
 
-#****************************************************************************
+def bearRegisterItem(type, desc, famName, params, function, famDesc=None):
+    # for plugins: the generator itself is registered with bearMaker.registerGenerator(),
+    # its catalog tables with bearCatalog.addPath()
+    bearItemsTable[type] = (desc, famName, params, function)
+    if famName not in bearFamilies:
+        bearFamilies[famName] = {'desc': famDesc if famDesc is not None else famName}
+    if not ('items' in bearFamilies[famName]):
+        bearFamilies[famName]['items'] = []
+    if type not in bearFamilies[famName]['items']:
+        bearFamilies[famName]['items'].append(str(type))
 
-def bearGetAttachableSelections():
-    def positionDone(center, radius, doneList, tol=1e-6):
-        for itm in doneList:
-            if center.isEqual(itm[0], tol) and math.isclose(radius, itm[1], abs_tol = tol):
-                return True
-        return False
-
-    def getEdgeName(obj, edge):
-        i = 1
-        for e in obj.Edges:
-            if e.isSame(edge):
-                return 'Edge' + str(i)
-            i += 1
-        return None
 
-    asels = []
-    for selObj in Gui.Selection.getSelectionEx():
-        baseObjectNames = selObj.SubElementNames
-        obj = selObj.Object
-        grp = obj.getParentGeoFeatureGroup()
-        if grp is not None and hasattr(grp, 'TypeId') and grp.TypeId == "PartDesign::Body":
-            obj = grp
-
-        posDoneList = []
-
-        for bObjN in baseObjectNames:
-            shape = obj.Shape.getElement(bObjN)
+#****************************************************************************
 
-            if hasattr(shape, 'Curve'):
-                if not hasattr(shape.Curve, 'Center'):
-                    continue
-                if not hasattr(shape.Curve, 'Radius'):
-                    continue
-                if positionDone(shape.Curve.Center, shape.Curve.Radius, posDoneList):
-                    continue
-                asels.append((obj, [bObjN]))
-                posDoneList.append([shape.Curve.Center, shape.Curve.Radius])
-#                FreeCAD.Console.PrintMessage("Linking to " + obj.Name + "[" + bObjN + "]\n")
-
-            elif isinstance(shape, Part.Face):
-                outerEdgeList = shape.OuterWire.Edges
-                for edge in shape.Edges:
-                    if not hasattr(edge, 'Curve'):
-                        continue
-                    if not hasattr(edge.Curve, 'Center'):
-                        continue
-                    if not hasattr(edge.Curve, 'Radius'):
-                        continue
-                    if positionDone(edge.Curve.Center, edge.Curve.Radius, posDoneList):
-                        continue
-                    for outerEdge in outerEdgeList:
-                        if outerEdge.isSame(edge):
-                            edge = None
-                            break
-                    if edge is None:
-                        continue
-                    edgeName = getEdgeName(obj.Shape, edge)
-                    if edgeName is None:
-                        continue
-                    asels.append((obj, [edgeName]))
-                    posDoneList.append([edge.Curve.Center, edge.Curve.Radius])
-#                    FreeCAD.Console.PrintMessage("Linking to " + "[" + edgeName + "[\n")
-
-    if len(asels) == 0:
-        asels.append(None)
-    return asels
+def bearGetAttachableSelections():
+    # GUI-only, kept behind a lazy import so BearUtils works in FreeCADCmd
+    import BearSelection
+    return BearSelection.bearGetAttachableSelections()
 
 
 def csv2dict(fileName, defTableName, fieldNamed = True):
@@ -172,20 +151,24 @@ def csv2dict(fileName, defTableName, fieldNamed = True):
 #****************************************************************************
 
 class bearFaceMaker:
+    # the profile is kept as plain data (start point, line and arc segments in the XZ plane),
+    # OCC edges are only created once in getClosedWire()
 
     def __init__(self):
         self.reset()
 
     def reset(self):
-        self.edges = []
         self.firstPoint = None
+        self.lastPoint = None
+        self.segments = []
+        self.startTime = time.perf_counter()
 
     def addPoint(self, x, z):
-        curPoint = FreeCAD.Base.Vector(x, 0, z)
+        curPoint = (float(x), float(z))
         if self.firstPoint is None:
             self.firstPoint = curPoint
         else:
-            self.edges.append(Part.makeLine(self.lastPoint, curPoint))
+            self.segments.append(('L', curPoint))
         self.lastPoint = curPoint
 
     def addPoints(self, *args):
@@ -200,15 +183,14 @@ class bearFaceMaker:
         self.addPoint(x, z)
 
     def addArc(self, x1, z1, x2, z2):
-        midPoint = FreeCAD.Base.Vector(x1, 0, z1)
-        endPoint = FreeCAD.Base.Vector(x2, 0, z2)
-        self.edges.append(Part.Arc(self.lastPoint, midPoint, endPoint).toShape())
+        endPoint = (float(x2), float(z2))
+        self.segments.append(('A', (float(x1), float(z1)), endPoint))
         self.lastPoint = endPoint
 
     def addArc2(self, xc, zc, a):
         a = math.radians(a)
-        xac = self.lastPoint.x + xc
-        zac = self.lastPoint.z + zc
+        xac = self.lastPoint[0] + xc
+        zac = self.lastPoint[1] + zc
         sa = math.atan2(-zc, -xc)
         r = math.sqrt(xc * xc + zc * zc)
         sa += a / 2.0
@@ -219,28 +201,496 @@ class bearFaceMaker:
         z2 = zac + r * math.sin(sa)
         self.addArc(x1, z1, x2, z2)
 
+    def getKey(self, digits=9):
+        # hashable description of the profile, equal for equal profiles
+        key = [tuple(round(v, digits) for v in self.firstPoint)]
+        for segment in self.segments:
+            key.append((segment[0],) + tuple(round(v, digits) for point in segment[1:] for v in point))
+        return tuple(key)
+
     def getClosedWire(self):
-        self.edges.append(Part.makeLine(self.lastPoint, self.firstPoint))
-        return Part.Wire(self.edges)
+        def vec(point):
+            return FreeCAD.Base.Vector(point[0], 0, point[1])
+
+        edges = []
+        prevPoint = vec(self.firstPoint)
+        for segment in self.segments:
+            endPoint = vec(segment[-1])
+            if segment[0] == 'L':
+                edges.append(Part.makeLine(prevPoint, endPoint))
+            else:
+                edges.append(Part.Arc(prevPoint, vec(segment[1]), endPoint).toShape())
+            prevPoint = endPoint
+        if self.lastPoint != self.firstPoint:
+            edges.append(Part.makeLine(prevPoint, vec(self.firstPoint)))
+        return Part.Wire(edges)
 
     def getFace(self):
-        return Part.Face(self.getClosedWire())
+        face = Part.Face(self.getClosedWire())
+        if bearStats.enabled:
+            bearStats.add('profile', (time.perf_counter() - self.startTime) * 1000)
+        return face
 
     def revolveZ(self, profile: Part.Shape) -> Part.Shape:
-        return profile.revolve(FreeCAD.Base.Vector(0, 0, 0), FreeCAD.Base.Vector(0, 0, 1), 360)
+        with bearStats.phase('revolve'):
+            return profile.revolve(FreeCAD.Base.Vector(0, 0, 0), FreeCAD.Base.Vector(0, 0, 1), 360)
+
+    def getRevolved(self):
+        # revolved solids are shared between all bearings (sizes, options) with the same
+        # profile, callers must not modify the returned shape
+        key = self.getKey()
+        shape = bearRevolveCache.get(key)
+        if shape is None:
+            shape = self.revolveZ(self.getFace())
+            bearRevolveCache.put(key, shape)
+        return shape
 
     def hasShape(self):
-        return (len(self.edges) != 0)
+        return (len(self.segments) != 0)
+
+
+def bearMakeTube(rIn, rOut, zBottom, zTop):
+    fm = bearFaceMaker()
+    fm.addPoints((rIn, zBottom), (rOut, zBottom), (rOut, zTop), (rIn, zTop))
+    return fm.getRevolved()
+
+
+def bearGetDetail(fp):
+    return getattr(fp, 'detail', 'Full')
+
+
+def bearGetOutputMode(fp):
+    return getattr(fp, 'outputMode', 'Fused')
 
 #****************************************************************************
 
-bearData = {}
-bearTitles = {}
-fileList = Path(_dataPath).glob("*.csv")
-for file in fileList:
-    tables = csv2dict(str(file), file.stem, True)
-    for tableName in tables.keys():
-        if tableName == 'titles':
-            bearTitles.update(tables[tableName])
+class bearLRUCache:
+
+    def __init__(self, maxSize=256):
+        self.maxSize = maxSize
+        self.reset()
+
+    def reset(self):
+        self.items = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        if key in self.items:
+            self.items.move_to_end(key)
+            self.hits += 1
+            return self.items[key]
+        self.misses += 1
+        return None
+
+    def put(self, key, value):
+        self.items[key] = value
+        self.items.move_to_end(key)
+        while len(self.items) > self.maxSize:
+            self.items.popitem(last=False)
+
+    def stats(self):
+        return {'size': len(self.items), 'maxSize': self.maxSize, 'hits': self.hits, 'misses': self.misses}
+
+    def __len__(self):
+        return len(self.items)
+
+#****************************************************************************
+
+def bearGetCircleData(shape):
+    try:
+        curve = shape.Curve
+    except Exception:
+        return None
+    if not (hasattr(curve, 'Center') and hasattr(curve, 'Axis') and hasattr(curve, 'Radius')):
+        return None
+    c = curve.Center
+    a = curve.Axis
+    return [c.x, c.y, c.z, a.x, a.y, a.z, curve.Radius]
+
+
+def bearIsSameCircle(data1, data2, tol=1e-6):
+    if data1 is None or data2 is None:
+        return False
+    for i in (0, 1, 2, 6):
+        if not math.isclose(data1[i], data2[i], abs_tol=tol):
+            return False
+    # axis may be flipped
+    dot = data1[3] * data2[3] + data1[4] * data2[4] + data1[5] * data2[5]
+    return math.isclose(abs(dot), 1.0, abs_tol=tol)
+
+
+def bearGetBoreAxis(data):
+    # axis line of a circle: the point of the axis closest to the origin, the axis direction
+    # pointing up (+Z, else +Y, else +X) and the position of the circle along that direction
+    axis = data[3:6]
+    for i in (2, 1, 0):
+        if abs(axis[i]) > 1e-9:
+            if axis[i] < 0:
+                axis = [-v for v in axis]
+            break
+    pos = sum(c * a for c, a in zip(data[0:3], axis))
+    foot = [c - pos * a for c, a in zip(data[0:3], axis)]
+    return foot, axis, pos
+
+
+class bearCircleGrid:
+    # spatial hash over (center, radius), cells are larger than the tolerance so a
+    # lookup only has to visit the cells the tolerance box touches (usually one)
+
+    def __init__(self, tol=1e-6, cellSize=1e-3):
+        self.tol = tol
+        self.cellSize = max(cellSize, 2 * tol)
+        self.cells = {}
+
+    def getKeyRanges(self, values, tol):
+        return [range(math.floor((v - tol) / self.cellSize), math.floor((v + tol) / self.cellSize) + 1) for v in values]
+
+    def add(self, center, radius, item=None):
+        values = (center[0], center[1], center[2], radius)
+        key = tuple(math.floor(v / self.cellSize) for v in values)
+        self.cells.setdefault(key, []).append((values, item))
+
+    def findAll(self, center, radius):
+        values = (center[0], center[1], center[2], radius)
+        found = []
+        r0, r1, r2, r3 = self.getKeyRanges(values, self.tol)
+        for k0 in r0:
+            for k1 in r1:
+                for k2 in r2:
+                    for k3 in r3:
+                        for cellValues, item in self.cells.get((k0, k1, k2, k3), []):
+                            if all(math.isclose(a, b, abs_tol=self.tol) for a, b in zip(values, cellValues)):
+                                found.append(item)
+        return found
+
+    def contains(self, center, radius):
+        return len(self.findAll(center, radius)) > 0
+
+
+class bearEdgeIndex:
+
+    def __init__(self, shape):
+        self.byHash = {}
+        self.circles = []
+        self.circleGrid = bearCircleGrid()
+        for i, edge in enumerate(shape.Edges, 1):
+            name = 'Edge' + str(i)
+            self.byHash.setdefault(edge.hashCode(), []).append((edge, name))
+            data = bearGetCircleData(edge)
+            if data is not None:
+                self.circles.append((name, data))
+                self.circleGrid.add(data[0:3], data[6], (name, data))
+
+    def getName(self, edge):
+        for e, name in self.byHash.get(edge.hashCode(), []):
+            if e.isSame(edge):
+                return name
+        return None
+
+    def findCircle(self, data):
+        for name, circle in self.circleGrid.findAll(data[0:3], data[6]):
+            if bearIsSameCircle(circle, data, self.circleGrid.tol):
+                return name
+        return None
+
+    def findDiameter(self, diameter, tol=1e-6):
+        # one circle per bore, the end circles of a bore are coaxial with the same radius.
+        # Of those the top end is taken, see bearGetBoreAxis.
+        bores = []
+        boreGrid = bearCircleGrid(tol)
+        for name, data in self.circles:
+            if not math.isclose(2 * data[6], diameter, abs_tol=tol):
+                continue
+            foot, axis, pos = bearGetBoreAxis(data)
+            for bore in boreGrid.findAll(foot, data[6]):
+                if math.isclose(abs(sum(a * b for a, b in zip(axis, bore[0]))), 1.0, abs_tol=tol):
+                    if pos > bore[1]:
+                        bore[1] = pos
+                        bore[2] = name
+                    break
+            else:
+                bore = [axis, pos, name]
+                boreGrid.add(foot, data[6], bore)
+                bores.append(bore)
+        return [bore[2] for bore in bores]
+
+
+_edgeIndexCache = bearLRUCache(16)
+bearRevolveCache = bearLRUCache(REVOLVE_CACHE_SIZE)
+bearElementCache = bearLRUCache(ELEMENT_CACHE_SIZE)
+
+
+def bearResetShapeCaches():
+    # forget the shared revolved rings and rolling elements, the next bearing is generated from scratch
+    bearRevolveCache.reset()
+    bearElementCache.reset()
+
+
+def bearGetEdgeIndex(shape):
+    # the cache keeps the shape alive, so its hashCode cannot be reused by another shape
+    entry = _edgeIndexCache.get(shape.hashCode())
+    if entry is None or not entry[0].isSame(shape):
+        entry = (shape, bearEdgeIndex(shape))
+        _edgeIndexCache.put(shape.hashCode(), entry)
+    return entry[1]
+
+
+def bearGetBores(obj, diameter, tol=1e-6):
+    # all circular edges of obj with the given diameter, one per bore
+    return [(obj, [name]) for name in bearGetEdgeIndex(obj.Shape).findDiameter(diameter, tol)]
+
+#****************************************************************************
+
+# rolling elements in their position for angle 0, add new element kinds here
+bearElementMakers = {
+    # radius, x and z of the center
+    'ball': lambda r, x, z: Part.makeSphere(r, FreeCAD.Base.Vector(x, 0.0, z)),
+    # radius, length, x of the inner end and z of the axis, pointing radially outwards
+    'needle': lambda r, l, x, z: Part.makeCylinder(r, l, FreeCAD.Base.Vector(x, 0.0, z), FreeCAD.Base.Vector(1, 0, 0), 360),
+}
+
+
+def bearGetPolarPlacements(count, angle=None):
+    # rotations around Z for all elements in one pass, as quaternions (0, 0, sin(a/2), cos(a/2))
+    import numpy
+    if angle is None:
+        angle = 360.0 / count
+    halfAngles = numpy.radians(numpy.arange(count) * angle) / 2
+    quats = numpy.zeros((count, 4))
+    quats[:, 2] = numpy.sin(halfAngles)
+    quats[:, 3] = numpy.cos(halfAngles)
+    origin = FreeCAD.Base.Vector(0, 0, 0)
+    return [FreeCAD.Placement(origin, FreeCAD.Rotation(*q)) for q in quats.tolist()]
+
+
+def bearPolarPattern(kind, dims, count, angle=None):
+    # compound of count elements around Z, the element and the pattern are cached per size
+    # and shared, callers must not modify the returned shape
+    dims = tuple(round(d, 9) for d in dims)
+    key = (kind, dims, count, None if angle is None else round(angle, 9))
+    pattern = bearElementCache.get(key)
+    if pattern is None:
+        element = bearElementCache.get((kind, dims))
+        if element is None:
+            element = bearElementMakers[kind](*dims)
+            bearElementCache.put((kind, dims), element)
+        if hasattr(element, 'moved'):
+            # located copies share the geometry of the element
+            copies = [element.moved(pl) for pl in bearGetPolarPlacements(count, angle)]
         else:
-            bearData[tableName] = tables[tableName]
+            step = 360.0 / count if angle is None else angle
+            copies = [element.rotated(FreeCAD.Base.Vector(0, 0, 0), FreeCAD.Base.Vector(0, 0, 1), n * step) for n in range(count)]
+        pattern = Part.makeCompound(copies)
+        bearElementCache.put(key, pattern)
+    return pattern
+
+#****************************************************************************
+
+def bearGetTableType(tableName):
+    return tableName.split('_')[0]
+
+
+class bearTableView(Mapping):
+
+    def __init__(self, catalog, store):
+        self.catalog = catalog
+        self.store = store
+
+    def __getitem__(self, tableName):
+        self.catalog.loadType(bearGetTableType(tableName))
+        return self.store[tableName]
+
+    def __contains__(self, tableName):
+        self.catalog.loadType(bearGetTableType(tableName))
+        return tableName in self.store
+
+    def __iter__(self):
+        self.catalog.loadAll()
+        return iter(self.store)
+
+    def __len__(self):
+        self.catalog.loadAll()
+        return len(self.store)
+
+
+class bearColumnTable:
+
+    def __init__(self, titles, table):
+        import numpy
+        self.titles = tuple(titles)
+        self.sizeCodes = numpy.array(list(table.keys()))
+        # rows with a wrong number of values are cut or padded with NaN, so they never match a query
+        width = len(self.titles)
+        rows = numpy.full((len(table), width), numpy.nan)
+        for i, row in enumerate(table.values()):
+            values = [v if isinstance(v, float) else numpy.nan for v in row[:width]]
+            rows[i, :len(values)] = values
+        self.columns = {}
+        for i, title in enumerate(self.titles):
+            self.columns[title] = rows[:, i]
+
+    def __len__(self):
+        return len(self.sizeCodes)
+
+    def __getitem__(self, column):
+        return self.columns[column]
+
+    def mask(self, **ranges):
+        import numpy
+        mask = numpy.ones(len(self.sizeCodes), dtype=bool)
+        for column, (low, high) in ranges.items():
+            if low is not None:
+                mask &= self.columns[column] >= low
+            if high is not None:
+                mask &= self.columns[column] <= high
+        return mask
+
+    def filter(self, **ranges):
+        return self.sizeCodes[self.mask(**ranges)].tolist()
+
+    def sort(self, column, sizeCodes=None, reverse=False):
+        import numpy
+        index = numpy.argsort(self.columns[column], kind='stable')
+        if reverse:
+            index = index[::-1]
+        result = self.sizeCodes[index]
+        if sizeCodes is not None:
+            result = result[numpy.isin(result, sizeCodes)]
+        return result.tolist()
+
+    def nearest(self, column, value, count=1, **ranges):
+        import numpy
+        index = numpy.flatnonzero(self.mask(**ranges))
+        dist = numpy.abs(self.columns[column][index] - value)
+        index = index[numpy.argsort(dist, kind='stable')[:count]]
+        return self.sizeCodes[index].tolist()
+
+
+# bump whenever the layout of the compiled catalog changes
+CATALOG_FORMAT_VERSION = 1
+
+
+class bearCatalogClass:
+
+    def __init__(self, path, compiledFile=None):
+        self.paths = [path]
+        self.lock = threading.RLock()
+        self.compiledFile = compiledFile
+        self.compiled = None
+        self.compiledDirty = False
+        self.fileIndex = None
+        self.typeIndex = {}
+        self.tables = {}
+        self.titles = {}
+        self.columnTables = {}
+        self.data = bearTableView(self, self.tables)
+        self.titlesView = bearTableView(self, self.titles)
+
+    def getFileIndex(self):
+        if self.fileIndex is None:
+            self.fileIndex = {}
+            for path in self.paths:
+                for file in sorted(Path(path).glob("*.csv")):
+                    self.fileIndex.setdefault(bearGetTableType(file.stem), []).append(file)
+        return self.fileIndex
+
+    def getTypes(self):
+        return list(self.getFileIndex().keys())
+
+    def getCompiled(self):
+        if self.compiled is None:
+            self.compiled = {}
+            if self.compiledFile is not None and os.path.isfile(self.compiledFile):
+                try:
+                    with open(self.compiledFile, 'rb') as fp:
+                        compiled = pickle.load(fp)
+                    if compiled.get('version') == CATALOG_FORMAT_VERSION:
+                        self.compiled = compiled['files']
+                except Exception:
+                    FreeCAD.Console.PrintWarning("Bearing catalog: ignoring unreadable " + self.compiledFile + "\n")
+        return self.compiled
+
+    def saveCompiled(self):
+        if not self.compiledDirty or self.compiledFile is None:
+            return
+        self.compiledDirty = False
+        tmpName = self.compiledFile + '.' + str(os.getpid()) + '.tmp'
+        try:
+            os.makedirs(os.path.dirname(self.compiledFile), exist_ok=True)
+            with open(tmpName, 'wb') as fp:
+                pickle.dump({'version': CATALOG_FORMAT_VERSION, 'files': self.compiled}, fp, pickle.HIGHEST_PROTOCOL)
+            os.replace(tmpName, self.compiledFile)
+        except Exception:
+            FreeCAD.Console.PrintWarning("Bearing catalog: could not write " + self.compiledFile + "\n")
+
+    def readTables(self, file):
+        compiled = self.getCompiled()
+        stat = file.stat()
+        stamp = (stat.st_mtime_ns, stat.st_size)
+        entry = compiled.get(str(file))
+        if entry is not None and entry[0] == stamp:
+            return entry[1]
+        tables = csv2dict(str(file), file.stem, True)
+        compiled[str(file)] = (stamp, tables)
+        self.compiledDirty = True
+        return tables
+
+    def loadType(self, type):
+        if type in self.typeIndex:
+            return self.typeIndex[type]
+        with self.lock:
+            if type in self.typeIndex:
+                return self.typeIndex[type]
+            tableNames = []
+            for file in self.getFileIndex().get(type, []):
+                tables = self.readTables(file)
+                for tableName in tables.keys():
+                    if tableName == 'titles':
+                        self.titles.update(tables[tableName])
+                    else:
+                        self.tables[tableName] = tables[tableName]
+                        tableNames.append(tableName)
+            self.typeIndex[type] = tableNames
+            self.saveCompiled()
+            return tableNames
+
+    def loadAll(self):
+        for type in self.getTypes():
+            self.loadType(type)
+
+    def addPath(self, path):
+        with self.lock:
+            if path not in self.paths:
+                self.paths.append(path)
+            self.fileIndex = None
+            self.typeIndex.clear()
+            self.columnTables.clear()
+
+    def getTableNames(self, type):
+        return self.loadType(type)
+
+    def getColumnTable(self, type):
+        if type not in self.columnTables:
+            tableName = type + '_def'
+            self.columnTables[type] = bearColumnTable(self.titlesView[tableName], self.data[tableName])
+        return self.columnTables[type]
+
+    def reload(self):
+        self.compiled = None
+        self.fileIndex = None
+        self.typeIndex.clear()
+        self.columnTables.clear()
+        self.tables.clear()
+        self.titles.clear()
+
+
+def bearGetCompiledCatalogFile():
+    if not bearGetParams().GetBool('CompiledCatalog', True):
+        return None
+    return os.path.join(bearGetCachePath(), 'catalog.pickle')
+
+
+bearCatalog = bearCatalogClass(_dataPath, bearGetCompiledCatalogFile())
+bearData = bearCatalog.data
+bearTitles = bearCatalog.titlesView
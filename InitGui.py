@@ -35,7 +35,9 @@ class BearingWorkbench(Workbench):
     def Initialize(self):
         from BearUtils import bearFamilies as _bearFam
         from BearUtils import bearItemsTable as _bearItems
+        from BearMaker import bearMaker as _bearMaker
         import BearCmd
+        import threading
         FreeCAD.Console.PrintMessage("Initialize\n")
 
         self.modifyCmds = BearCmd.bearGetModifierCmds()
@@ -48,6 +50,9 @@ class BearingWorkbench(Workbench):
             for bearItem in famItem['items']:
                 Gui.addCommand(bearItem, BearCmd.bearItemCmd(bearItem, _bearItems[bearItem][0]))
 
+        # parse the catalog and import the generators now, not on the first click
+        threading.Thread(target=_bearMaker.warmUp, daemon=True).start()
+
     def Activated(self):
         pass
 